@@ -0,0 +1,26 @@
+#!/bin/bash
+# Compile the per-document serialization helpers with mypyc for production runs.
+# The extension goes to build/native, which only `python main.py` puts on sys.path;
+# `uvicorn main:app --reload` (start_server.sh) always runs the pure-Python source.
+set -u
+cd "$(dirname "$0")"
+
+mkdir -p logs
+echo "Installing build dependencies..."
+pip install -r requirements-dev.txt
+
+echo "Compiling serialization helpers with mypyc..."
+rm -rf build/native
+mkdir -p build/native
+if (cd build/native && mypyc ../../serialization.py) > logs/mypyc.log 2>&1 && (cd build/native && python -c '
+import serialization
+assert serialization.__file__.endswith(".so"), serialization.__file__
+assert serialization.serialize({"_id": "a", "n": 1}) == {"n": 1, "id": "a"}
+assert serialization.orjson_default(__import__("bson").ObjectId("0" * 24)) == "0" * 24
+') >> logs/mypyc.log 2>&1; then
+  echo "Built build/native; run 'python main.py' to serve with the compiled helpers"
+else
+  rm -rf build/native
+  echo "mypyc build failed (see logs/mypyc.log); main.py will use the pure-Python helpers"
+  exit 1
+fi
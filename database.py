@@ -3,11 +3,18 @@ Database Helper Functions
 
 MongoDB helper functions ready to use in your backend code.
 Import and use these functions in your API endpoints for database operations.
+Everything is backed by Motor and never blocks the event loop:
+- create_document, get_documents and ensure_indexes are coroutines and must be awaited
+- find_documents and aggregate_documents return async cursors to iterate with `async for`
+- connect and close are plain functions run from the app's startup/shutdown hooks
 """
 
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
 from datetime import datetime, timezone
 import os
+import sys
 from dotenv import load_dotenv
 from typing import Union
 from pydantic import BaseModel
@@ -18,15 +25,76 @@ load_dotenv()
 _client = None
 db = None
 
+class ObjectIdToStr(TypeDecoder):
+    """Decode ObjectIds straight to str inside PyMongo's BSON decoder"""
+    bson_type = ObjectId
+
+    def transform_bson(self, value):
+        return str(value)
+
+# Documents read through db never contain ObjectId instances, so they are JSON-ready as-is
+CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([ObjectIdToStr()]))
+
+# Collection handles for the app's schemas, keyed by interned name and bound in connect()
+COLLECTION_NAMES = tuple(sys.intern(n) for n in ("client", "employee", "project", "task", "invoice"))
+COLLECTIONS = {}
+
 database_url = os.getenv("DATABASE_URL")
 database_name = os.getenv("DATABASE_NAME")
 
-if database_url and database_name:
-    _client = MongoClient(database_url)
-    db = _client[database_name]
+def connect():
+    """Create the process-wide Motor client.
+
+    Called from the app's startup hook rather than at import, so each worker
+    process opens its own pool after uvicorn has spawned it.
+    """
+    global _client, db
+    if _client is None and database_url and database_name:
+        _client = AsyncIOMotorClient(
+            database_url,
+            maxPoolSize=50,
+            minPoolSize=10,
+            maxIdleTimeMS=60_000,
+            serverSelectionTimeoutMS=2000,
+            compressors="zstd",
+        )
+        db = _client.get_database(database_name, codec_options=CODEC_OPTIONS)
+        COLLECTIONS.update((n, db[n]) for n in COLLECTION_NAMES)
+    return db
+
+def close():
+    """Close the Motor client and its pooled connections"""
+    global _client, db
+    if _client is not None:
+        _client.close()
+    _client = None
+    db = None
+    COLLECTIONS.clear()
+
+def _collection(collection_name: str):
+    """Return the cached handle for known collections, or look it up on db"""
+    collection = COLLECTIONS.get(collection_name)
+    if collection is None:
+        collection = db[collection_name]
+    return collection
+
+# Indexes backing the filtered list endpoints, as (collection, key spec) pairs
+INDEXES = (
+    ("task", [("project_id", 1)]),
+    ("project", [("client_id", 1)]),
+    ("invoice", [("client_id", 1), ("project_id", 1)]),
+    ("invoice", [("project_id", 1)]),
+)
+
+async def ensure_indexes():
+    """Create the indexes used by filtered list queries (no-op if they already exist)"""
+    if db is None:
+        return
+    for collection_name, keys in INDEXES:
+        await _collection(collection_name).create_index(keys)
 
 # Helper functions for common database operations
-def create_document(collection_name: str, data: Union[BaseModel, dict]):
+async def create_document(collection_name: str, data: Union[BaseModel, dict]):
     """Insert a single document with timestamp"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
@@ -40,16 +108,30 @@ def create_document(collection_name: str, data: Union[BaseModel, dict]):
     data_dict['created_at'] = datetime.now(timezone.utc)
     data_dict['updated_at'] = datetime.now(timezone.utc)
 
-    result = db[collection_name].insert_one(data_dict)
+    result = await _collection(collection_name).insert_one(data_dict)
     return str(result.inserted_id)
 
-def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None):
-    """Get documents from collection"""
+async def get_documents(collection_name: str, filter_dict: dict = None, limit: int = None, projection: dict = None):
+    """Get documents from collection, optionally restricted to the projected fields"""
     if db is None:
         raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
     
-    cursor = db[collection_name].find(filter_dict or {})
+    cursor = _collection(collection_name).find(filter_dict or {}, projection)
     if limit:
         cursor = cursor.limit(limit)
     
-    return list(cursor)
+    return await cursor.to_list(length=None)
+
+def find_documents(collection_name: str, filter_dict: dict = None, projection: dict = None):
+    """Return an async cursor over a collection for callers that stream results"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return _collection(collection_name).find(filter_dict or {}, projection)
+
+def aggregate_documents(collection_name: str, pipeline: list):
+    """Return an async cursor over an aggregation pipeline run server-side"""
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+
+    return _collection(collection_name).aggregate(pipeline)
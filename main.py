@@ -1,66 +1,225 @@
 import os
+import sys
+import glob
+import logging
+import time
+from collections import defaultdict
 from typing import List, Optional
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from bson import ObjectId
-
-from database import db, create_document, get_documents
-from schemas import Client, Employee, Project, Task, Invoice
-
-app = FastAPI()
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, ValidationError
+import orjson
+from cachetools import TTLCache
+
+if __name__ == "__main__":
+    # Production entry point: prefer the mypyc build from build_native.sh (inherited by the
+    # spawned workers through sys.path), unless serialization.py changed after it was built
+    _NATIVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "build", "native")
+    _native = glob.glob(os.path.join(_NATIVE_DIR, "serialization*.so"))
+    _source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "serialization.py")
+    if _native and os.path.getmtime(_native[0]) >= os.path.getmtime(_source):
+        sys.path.insert(0, _NATIVE_DIR)
+
+import database
+from database import aggregate_documents, create_document, ensure_indexes, find_documents, get_documents
+from middleware import FastCORSMiddleware
+from analytics import BILLABLE_STATUSES, INVOICE_SOA_PROJECTION, invoices_to_soa, revenue_by_client, warm_up
+from schemas import Client, Employee, Project, Task, Invoice, InvoiceStatus
+from serialization import orjson_default, serialize
+
+logger = logging.getLogger(__name__)
+
+app = FastAPI(default_response_class=ORJSONResponse)
+
+app.add_middleware(FastCORSMiddleware)
+# JSON lists compress well; a mid compression level keeps the CPU cost below the bandwidth saved
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+def _collection_meta(model):
+    """Projection and declared fields for a schema's collection, derived from the model once.
+
+    The projection covers every declared or computed field plus timestamps (_id is always
+    returned).
+    """
+    fields = (*model.model_fields, *model.model_computed_fields)
+    projection = {f: 1 for f in (*fields, "created_at", "updated_at")}
+    return projection, frozenset(model.model_fields)
+
+# Per-collection field metadata, computed at import so requests never introspect the schemas
+_META = {model.__name__.lower(): _collection_meta(model) for model in (Client, Employee, Project, Task, Invoice)}
+
+# Flush streamed list bodies in chunks of roughly this many bytes
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+async def _stream_json_array(first: dict, cursor):
+    """Encode first plus the rest of cursor as a JSON array without materializing the result set"""
+    buf = bytearray(b"[")
+    buf += orjson.dumps(serialize(first), default=orjson_default)
+    async for doc in cursor:
+        buf += b","
+        buf += orjson.dumps(serialize(doc), default=orjson_default)
+        if len(buf) >= _STREAM_CHUNK_SIZE:
+            yield bytes(buf)
+            buf.clear()
+    buf += b"]"
+    yield bytes(buf)
+
+async def _streamed_response(cursor) -> Response:
+    """Stream a cursor as a JSON array.
+
+    The first document is fetched before the response starts, so query and connection
+    errors still surface as a 500 instead of a 200 with a truncated body.
+    """
+    try:
+        first = await cursor.next()
+    except StopAsyncIteration:
+        return Response(content=b"[]", media_type="application/json")
+    return StreamingResponse(_stream_json_array(first, cursor), media_type="application/json")
+
+# Encoded list bodies for small, rarely-changing collections, keyed by (collection, filter).
+# Writes in this process invalidate their collection; the TTL bounds staleness across workers.
+_list_cache = TTLCache(maxsize=256, ttl=5)
+
+# Bumped on every write; a body fetched across a bump may predate the write and is not stored
+_cache_generation = defaultdict(int)
+
+def _invalidate_cache(collection_name: str):
+    _cache_generation[collection_name] += 1
+    _list_cache.pop((collection_name, frozenset()), None)
+
+# List endpoints: (collection, route segment, query filter keys, serve from _list_cache).
+# Filter keys are part of the public API, so they are declared here rather than derived.
+_LIST_SPECS = (
+    ("client", "clients", (), True),
+    ("employee", "employees", (), True),
+    ("project", "projects", (), True),
+    ("task", "tasks", ("project_id",), False),
+    ("invoice", "invoices", ("client_id", "project_id"), False),
 )
 
-# Utility to convert Mongo _id to str recursively
+# Handlers are generated from source so each one has its collection, projection, cache key
+# and filter keys baked in, with no per-request lookups or branching on the spec
+_CACHED_LIST_TEMPLATE = """
+async def list_{plural}():
+    body = _list_cache.get(_KEY)
+    if body is None:
+        generation = _cache_generation[_NAME]
+        docs = await get_documents(_NAME, projection=_PROJECTION)
+        body = orjson.dumps([serialize(d) for d in docs], default=orjson_default)
+        if _cache_generation[_NAME] == generation:
+            _list_cache[_KEY] = body
+    return Response(content=body, media_type="application/json")
+"""
+
+_STREAMED_LIST_TEMPLATE = """
+async def list_{plural}({params}):
+    filt = {{}}
+{filters}
+    cursor = find_documents(_NAME, filt, _PROJECTION)
+    return await _streamed_response(cursor)
+"""
+
+def _register_list_endpoint(collection_name: str, plural: str, filter_keys: tuple, cached: bool):
+    projection, fields = _META[collection_name]
+    unknown = set(filter_keys) - fields
+    if unknown:
+        raise ValueError(f"Unknown filter keys for {collection_name}: {sorted(unknown)}")
+    if cached and filter_keys:
+        # _invalidate_cache drops one key per collection; filtered lists are streamed instead
+        raise ValueError(f"Cached list for {collection_name} cannot take filter keys")
+    params = ", ".join(f"{k}: Optional[str] = None" for k in filter_keys)
+    filters = []
+    for key in filter_keys:
+        filters.append(f"    if {key}:\n        filt[{key!r}] = {key}")
+    template = _CACHED_LIST_TEMPLATE if cached else _STREAMED_LIST_TEMPLATE
+    source = template.format(plural=plural, params=params, filters="\n".join(filters))
+    namespace = {
+        "__name__": __name__,
+        "Optional": Optional,
+        "Response": Response,
+        "orjson": orjson,
+        "orjson_default": orjson_default,
+        "serialize": serialize,
+        "get_documents": get_documents,
+        "find_documents": find_documents,
+        "_streamed_response": _streamed_response,
+        "_list_cache": _list_cache,
+        "_cache_generation": _cache_generation,
+        "_NAME": collection_name,
+        "_KEY": (collection_name, frozenset()),
+        "_PROJECTION": projection,
+    }
+    exec(compile(source, f"<list_{plural}>", "exec"), namespace)
+    app.get(f"/api/{plural}", response_model=None)(namespace[f"list_{plural}"])
+
+@app.on_event("startup")
+async def connect_database():
+    database.connect()
+    try:
+        await ensure_indexes()
+    except Exception as e:
+        # Keep serving; /test reports the database state
+        logger.warning("Could not create indexes: %s", e)
+
+@app.on_event("shutdown")
+def close_database():
+    database.close()
+
+@app.on_event("startup")
+def warm_analytics_kernels():
+    warm_up()
+
+def _json_response(obj) -> Response:
+    """Encode with orjson directly, skipping FastAPI's jsonable_encoder pass"""
+    return Response(content=orjson.dumps(obj, default=orjson_default), media_type="application/json")
+
+# Static bodies are encoded once at import
+_ROOT_BODY = orjson.dumps({"message": "Hello from FastAPI Backend!"})
+_HELLO_BODY = orjson.dumps({"message": "Hello from the backend API!"})
 
-def serialize_doc(doc: dict):
-    if not doc:
-        return doc
-    doc = dict(doc)
-    if "_id" in doc:
-        doc["id"] = str(doc.pop("_id"))
-    # Convert nested ObjectIds if any
-    for k, v in list(doc.items()):
-        if isinstance(v, ObjectId):
-            doc[k] = str(v)
-    return doc
+@app.get("/", response_model=None)
+async def read_root():
+    return Response(content=_ROOT_BODY, media_type="application/json")
 
-@app.get("/")
-def read_root():
-    return {"message": "Hello from FastAPI Backend!"}
+@app.get("/api/hello", response_model=None)
+async def hello():
+    return Response(content=_HELLO_BODY, media_type="application/json")
 
-@app.get("/api/hello")
-def hello():
-    return {"message": "Hello from the backend API!"}
+# Env configuration doesn't change at runtime, so report it from import-time reads
+_DATABASE_URL_STATUS = "✅ Set" if database.database_url else "❌ Not Set"
+_DATABASE_NAME_STATUS = "✅ Set" if database.database_name else "❌ Not Set"
+
+# Healthy /test results are reused for this many seconds so health probes don't each
+# hit Mongo; failures are never cached so recovery shows up on the next probe
+_HEALTH_TTL = 30.0
+_last_check = (0.0, None)  # (time.monotonic() of the check, response)
 
 @app.get("/test")
-def test_database():
+async def test_database():
     """Test endpoint to check if database is available and accessible"""
+    global _last_check
+    checked_at, cached = _last_check
+    now = time.monotonic()
+    if cached is not None and now - checked_at < _HEALTH_TTL:
+        return cached
+
     response = {
         "backend": "✅ Running",
         "database": "❌ Not Available",
         "database_url": None,
         "database_name": None,
         "connection_status": "Not Connected",
-        "collections": []
     }
 
+    db = database.db
     try:
         if db is not None:
             response["database"] = "✅ Available"
-            response["database_url"] = "✅ Configured"
-            response["database_name"] = db.name if hasattr(db, 'name') else "✅ Connected"
             response["connection_status"] = "Connected"
             try:
-                collections = db.list_collection_names()
-                response["collections"] = collections[:10]
+                await db.command("ping")
                 response["database"] = "✅ Connected & Working"
             except Exception as e:
                 response["database"] = f"⚠️  Connected but Error: {str(e)[:50]}"
@@ -69,76 +228,126 @@ def test_database():
     except Exception as e:
         response["database"] = f"❌ Error: {str(e)[:50]}"
 
-    import os as _os
-    response["database_url"] = "✅ Set" if _os.getenv("DATABASE_URL") else "❌ Not Set"
-    response["database_name"] = "✅ Set" if _os.getenv("DATABASE_NAME") else "❌ Not Set"
+    response["database_url"] = _DATABASE_URL_STATUS
+    response["database_name"] = _DATABASE_NAME_STATUS
 
+    if response["database"] == "✅ Connected & Working":
+        _last_check = (now, response)
     return response
 
 # --------------------------- Admin/Dashboard APIs ---------------------------
 
 # Clients
-@app.post("/api/clients")
-def create_client(payload: Client):
-    cid = create_document("client", payload)
-    return {"id": cid}
-
-@app.get("/api/clients")
-def list_clients():
-    docs = get_documents("client")
-    return [serialize_doc(d) for d in docs]
+@app.post("/api/clients", response_model=None)
+async def create_client(payload: Client):
+    cid = await create_document("client", payload)
+    _invalidate_cache("client")
+    return _json_response({"id": cid})
 
 # Employees
-@app.post("/api/employees")
-def create_employee(payload: Employee):
-    eid = create_document("employee", payload)
-    return {"id": eid}
-
-@app.get("/api/employees")
-def list_employees():
-    docs = get_documents("employee")
-    return [serialize_doc(d) for d in docs]
+@app.post("/api/employees", response_model=None)
+async def create_employee(payload: Employee):
+    eid = await create_document("employee", payload)
+    _invalidate_cache("employee")
+    return _json_response({"id": eid})
 
 # Projects
-@app.post("/api/projects")
-def create_project(payload: Project):
-    pid = create_document("project", payload)
-    return {"id": pid}
-
-@app.get("/api/projects")
-def list_projects():
-    docs = get_documents("project")
-    return [serialize_doc(d) for d in docs]
+@app.post("/api/projects", response_model=None)
+async def create_project(payload: Project):
+    pid = await create_document("project", payload)
+    _invalidate_cache("project")
+    return _json_response({"id": pid})
 
 # Tasks
-@app.post("/api/tasks")
-def create_task(payload: Task):
-    tid = create_document("task", payload)
-    return {"id": tid}
-
-@app.get("/api/tasks")
-def list_tasks(project_id: Optional[str] = None):
-    filt = {"project_id": project_id} if project_id else {}
-    docs = get_documents("task", filt)
-    return [serialize_doc(d) for d in docs]
+@app.post("/api/tasks", response_model=None)
+async def create_task(payload: Task):
+    tid = await create_document("task", payload)
+    return _json_response({"id": tid})
 
 # Invoices
-@app.post("/api/invoices")
-def create_invoice(payload: Invoice):
-    iid = create_document("invoice", payload)
-    return {"id": iid}
-
-@app.get("/api/invoices")
-def list_invoices(client_id: Optional[str] = None, project_id: Optional[str] = None):
-    filt = {}
-    if client_id:
-        filt["client_id"] = client_id
-    if project_id:
-        filt["project_id"] = project_id
-    docs = get_documents("invoice", filt)
-    return [serialize_doc(d) for d in docs]
+def _inline_json_schema(model) -> dict:
+    """JSON schema for model with its $defs inlined, so it can be embedded in openapi_extra"""
+    schema = model.model_json_schema()
+    defs = schema.pop("$defs", {})
+
+    def resolve(node):
+        if isinstance(node, dict):
+            if "$ref" in node:
+                return resolve(defs[node["$ref"].rsplit("/", 1)[-1]])
+            return {k: resolve(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [resolve(v) for v in node]
+        return node
+
+    return resolve(schema)
+
+# The body is parsed by hand below, so document it explicitly
+@app.post(
+    "/api/invoices",
+    response_model=None,
+    openapi_extra={
+        "requestBody": {
+            "content": {"application/json": {"schema": _inline_json_schema(Invoice)}},
+            "required": True,
+        }
+    },
+)
+async def create_invoice(request: Request):
+    # Invoices carry nested line items, so parse the raw body straight in pydantic-core
+    # instead of going through FastAPI's body resolver and an intermediate dict
+    try:
+        payload = Invoice.model_validate_json(await request.body())
+    except ValidationError as e:
+        raise RequestValidationError([{**err, "loc": ("body", *err["loc"])} for err in e.errors()])
+    iid = await create_document("invoice", payload)
+    return _json_response({"id": iid})
+
+# List endpoints, generated per collection (see _LIST_SPECS)
+for _spec in _LIST_SPECS:
+    _register_list_endpoint(*_spec)
+
+# Tasks joined with their project in one aggregation round-trip. project_id is stored as a
+# str, so it is converted to the project's ObjectId _id for the lookup; the _id index on
+# project serves the match.
+_TASK_PROJECT_LOOKUP = (
+    {"$lookup": {
+        "from": "project",
+        "let": {"pid": {"$convert": {"input": "$project_id", "to": "objectId", "onError": None, "onNull": None}}},
+        "pipeline": [
+            {"$match": {"$expr": {"$eq": ["$_id", "$$pid"]}}},
+            {"$project": {"_id": 0, "id": "$_id", "name": 1, "client_id": 1, "status": 1, "due_date": 1}},
+        ],
+        "as": "project",
+    }},
+    {"$unwind": {"path": "$project", "preserveNullAndEmptyArrays": True}},
+)
+
+@app.get("/api/tasks/with-project", response_model=None)
+async def list_tasks_with_project(project_id: Optional[str] = None):
+    pipeline = [{"$match": {"project_id": project_id}}] if project_id else []
+    pipeline += [{"$project": _META["task"][0]}, *_TASK_PROJECT_LOOKUP]
+    cursor = aggregate_documents("task", pipeline)
+    return await _streamed_response(cursor)
+
+# Analytics
+@app.get("/api/analytics/revenue-by-client", response_model=None)
+async def get_revenue_by_client(status: Optional[InvoiceStatus] = None):
+    # Without an explicit status only billable invoices count as revenue
+    filt = {"status": status} if status else {"status": {"$in": list(BILLABLE_STATUSES)}}
+    docs = await get_documents("invoice", filt, projection=INVOICE_SOA_PROJECTION)
+    return _json_response(revenue_by_client(invoices_to_soa(docs)))
 
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # One worker per core on uvloop + httptools; access logging is off as it is a per-request cost
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=os.cpu_count() or 1,
+        loop="uvloop",
+        http="httptools",
+        log_level="warning",
+        access_log=False,
+    )
@@ -0,0 +1,65 @@
+"""
+ASGI Middleware
+
+Allow-all CORS implemented directly on the ASGI interface. The backend accepts
+any origin, so there is no policy to evaluate: the response headers are fixed
+byte pairs, apart from echoing the request's Origin (needed for credentialed
+requests, which browsers reject with a wildcard origin).
+"""
+
+# Added to every response of a cross-origin request
+_CORS_HEADERS = (
+    (b"access-control-allow-credentials", b"true"),
+    (b"vary", b"Origin"),
+)
+
+# Added to preflight responses only
+_PREFLIGHT_HEADERS = (
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+    (b"content-type", b"text/plain; charset=utf-8"),
+    (b"content-length", b"2"),
+)
+
+class FastCORSMiddleware:
+    """Drop-in replacement for CORSMiddleware configured with "*" everywhere"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        origin = None
+        preflight = False
+        requested_headers = None
+        for name, value in scope["headers"]:
+            if name == b"origin":
+                origin = value
+            elif name == b"access-control-request-method":
+                preflight = True
+            elif name == b"access-control-request-headers":
+                requested_headers = value
+
+        if origin is None:
+            await self.app(scope, receive, send)
+            return
+
+        cors_headers = ((b"access-control-allow-origin", origin), *_CORS_HEADERS)
+
+        if preflight and scope["method"] == "OPTIONS":
+            headers = [*cors_headers, *_PREFLIGHT_HEADERS]
+            if requested_headers is not None:
+                headers.append((b"access-control-allow-headers", requested_headers))
+            await send({"type": "http.response.start", "status": 200, "headers": headers})
+            await send({"type": "http.response.body", "body": b"OK"})
+            return
+
+        async def send_with_cors(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", ()), *cors_headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
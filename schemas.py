@@ -11,16 +11,25 @@ Model name is converted to lowercase for the collection name:
 - Employee -> "employee" collection
 """
 
-from typing import Optional, List, Literal
-from pydantic import BaseModel, Field, EmailStr
+from typing import Annotated, Optional, List, Literal
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, computed_field
 from datetime import datetime
+from functools import cached_property
+import numpy as np
+
+# Lightweight email shape check; the pattern is compiled once by pydantic-core
+Email = Annotated[str, StringConstraints(pattern=r"^[^@\s]+@[^@\s]+\.[^@\s]+$")]
+
+InvoiceStatus = Literal["draft", "sent", "paid", "overdue", "void"]
 
 # Core SaaS data models for a video production studio
 
 class Client(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str = Field(..., description="Organization or person name")
     contact_name: Optional[str] = Field(None, description="Primary contact person")
-    email: Optional[EmailStr] = Field(None, description="Contact email")
+    email: Optional[Email] = Field(None, description="Contact email")
     phone: Optional[str] = Field(None, description="Contact phone")
     website: Optional[str] = Field(None, description="Client website")
     industry: Optional[str] = Field(None, description="Industry or vertical")
@@ -29,8 +38,10 @@ class Client(BaseModel):
     status: Literal["lead", "active", "inactive"] = Field("active", description="Lifecycle status")
 
 class Employee(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str = Field(..., description="Full name")
-    email: EmailStr = Field(..., description="Work email")
+    email: Email = Field(..., description="Work email")
     role: Literal["producer", "editor", "designer", "pm", "finance", "other"] = Field("other")
     rate_hour: Optional[float] = Field(None, ge=0, description="Hourly rate in USD")
     skills: List[str] = Field(default_factory=list, description="Capabilities/skills")
@@ -38,6 +49,8 @@ class Employee(BaseModel):
     active: bool = Field(True)
 
 class Project(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str = Field(..., description="Project name")
     client_id: Optional[str] = Field(None, description="Client reference id")
     description: Optional[str] = Field(None)
@@ -49,6 +62,8 @@ class Project(BaseModel):
     members: List[str] = Field(default_factory=list, description="Employee ids assigned")
 
 class Task(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     project_id: str = Field(..., description="Parent project id")
     title: str
     description: Optional[str] = None
@@ -60,11 +75,15 @@ class Task(BaseModel):
     labels: List[str] = Field(default_factory=list)
 
 class InvoiceItem(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     description: str
     quantity: float = Field(..., ge=0)
     unit_price: float = Field(..., ge=0)
 
 class Invoice(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     client_id: str
     project_id: Optional[str] = None
     number: Optional[str] = Field(None, description="Human-friendly invoice number")
@@ -74,18 +93,37 @@ class Invoice(BaseModel):
     items: List[InvoiceItem] = Field(default_factory=list)
     tax_rate: float = Field(0.0, ge=0, le=1, description="e.g. 0.07 for 7%")
     discount: float = Field(0.0, ge=0, description="Flat discount amount")
-    status: Literal["draft", "sent", "paid", "overdue", "void"] = "draft"
+    status: InvoiceStatus = "draft"
     notes: Optional[str] = None
 
+    @computed_field
+    @cached_property
+    def subtotal(self) -> float:
+        """Sum of quantity x unit_price over all line items (computed once per instance)"""
+        n = len(self.items)
+        q = np.fromiter((i.quantity for i in self.items), dtype=np.float64, count=n)
+        p = np.fromiter((i.unit_price for i in self.items), dtype=np.float64, count=n)
+        return float(q @ p)
+
+    @computed_field
+    @property
+    def total(self) -> float:
+        """Subtotal with tax applied, less the flat discount"""
+        return self.subtotal * (1 + self.tax_rate) - self.discount
+
 # Optional example models kept for reference; collections will still be created if used
 class User(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     name: str
-    email: EmailStr
+    email: Email
     address: Optional[str] = None
     age: Optional[int] = Field(None, ge=0, le=120)
     is_active: bool = True
 
 class Product(BaseModel):
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
     title: str
     description: Optional[str] = None
     price: float = Field(..., ge=0)
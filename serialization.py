@@ -0,0 +1,25 @@
+"""
+Serialization Helpers
+
+Per-document helpers used on every list response. This module has no FastAPI
+imports and is fully annotated so it can be compiled with mypyc
+(`mypyc serialization.py`); when no compiled extension is present the
+pure-Python source is imported as usual.
+"""
+
+from typing import Any, Dict
+from bson import ObjectId
+
+def serialize(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """Rename Mongo _id to id in place.
+
+    ObjectIds are already decoded to str by the database's type registry.
+    """
+    doc["id"] = doc.pop("_id")
+    return doc
+
+def orjson_default(obj: Any) -> str:
+    """Fallback encoder for orjson: stringify ObjectIds from documents not read through db"""
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    raise TypeError
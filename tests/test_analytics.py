@@ -0,0 +1,62 @@
+import pytest
+
+from analytics import invoice_totals, invoices_to_soa, revenue_by_client
+
+
+def _item(quantity, unit_price):
+    return {"description": "line", "quantity": quantity, "unit_price": unit_price}
+
+
+DOCS = [
+    # 2*5 + 3*1.5 = 14.5, plus 10% tax, less 2 -> 13.95
+    {"client_id": "a", "tax_rate": 0.1, "discount": 2.0, "items": [_item(2, 5.0), _item(3, 1.5)]},
+    # no items: only the discount applies -> -1
+    {"client_id": "b", "tax_rate": 0.2, "discount": 1.0, "items": []},
+    # 4*2.5 = 10, no tax or discount fields stored
+    {"client_id": "a", "items": [_item(4, 2.5)]},
+    # missing items key entirely
+    {"client_id": "b", "tax_rate": 0.0, "discount": 0.0},
+]
+
+
+def test_soa_layout():
+    soa = invoices_to_soa(DOCS)
+    assert soa["offsets"].tolist() == [0, 2, 2, 3, 3]
+    assert soa["quantity"].tolist() == [2, 3, 4]
+    assert soa["unit_price"].tolist() == [5.0, 1.5, 2.5]
+    assert soa["tax_rate"].tolist() == [0.1, 0.2, 0.0, 0.0]
+    assert soa["discount"].tolist() == [2.0, 1.0, 0.0, 0.0]
+    assert soa["client_id"].tolist() == ["a", "b", "a", "b"]
+
+
+def test_invoice_totals():
+    assert invoice_totals(invoices_to_soa(DOCS)) == pytest.approx([13.95, -1.0, 10.0, 0.0])
+
+
+def test_revenue_by_client_groups_invoices():
+    assert revenue_by_client(invoices_to_soa(DOCS)) == [
+        {"client_id": "a", "revenue": pytest.approx(23.95), "invoices": 2},
+        {"client_id": "b", "revenue": pytest.approx(-1.0), "invoices": 2},
+    ]
+
+
+def test_revenue_by_client_skips_invoices_without_client():
+    docs = [{"client_id": None, "items": [_item(1, 100.0)]}, {"client_id": "a", "items": [_item(1, 5.0)]}]
+    assert revenue_by_client(invoices_to_soa(docs)) == [{"client_id": "a", "revenue": 5.0, "invoices": 1}]
+
+
+def test_empty_input():
+    soa = invoices_to_soa([])
+    assert soa["offsets"].tolist() == [0]
+    assert len(invoice_totals(soa)) == 0
+    assert revenue_by_client(soa) == []
+    assert revenue_by_client(invoices_to_soa([{"client_id": None}])) == []
+
+
+def test_kernel_matches_invoice_model_total():
+    from schemas import Invoice
+
+    items = [_item(3, 19.99), _item(0.5, 120.0), _item(7, 0.1), _item(1, 1e6)]
+    invoice = Invoice(client_id="a", tax_rate=0.0825, discount=12.34, items=items)
+    doc = invoice.model_dump()
+    assert invoice_totals(invoices_to_soa([doc]))[0] == pytest.approx(invoice.total, rel=1e-12)
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+@pytest.fixture
+def created(monkeypatch):
+    calls = []
+
+    async def create_document(collection_name, data):
+        calls.append((collection_name, data))
+        return "inv1"
+
+    monkeypatch.setattr(main, "create_document", create_document)
+    return calls
+
+
+def test_valid_body_is_stored(created):
+    response = client.post("/api/invoices", json={
+        "client_id": "c1",
+        "items": [{"description": "edit", "quantity": 2, "unit_price": 50}],
+    })
+    assert response.status_code == 200
+    assert response.json() == {"id": "inv1"}
+    [(collection_name, invoice)] = created
+    assert collection_name == "invoice"
+    assert isinstance(invoice, main.Invoice)
+    assert invoice.items[0].quantity == 2
+
+
+def test_nested_item_error_location(created):
+    response = client.post("/api/invoices", json={
+        "client_id": "c1",
+        "items": [{"description": "edit", "quantity": -1, "unit_price": 50}],
+    })
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["loc"] == ["body", "items", 0, "quantity"]
+    assert error["type"] == "greater_than_equal"
+    assert created == []
+
+
+@pytest.mark.parametrize("body", [b"{not json", b""])
+def test_malformed_json(created, body):
+    response = client.post("/api/invoices", content=body, headers={"content-type": "application/json"})
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "json_invalid"
+    assert error["loc"] == ["body"]
+    assert created == []
+
+
+def test_unknown_key_is_forbidden(created):
+    response = client.post("/api/invoices", json={"client_id": "c1", "surprise": True})
+    assert response.status_code == 422
+    [error] = response.json()["detail"]
+    assert error["type"] == "extra_forbidden"
+    assert error["loc"] == ["body", "surprise"]
+    assert created == []
+
+
+def test_request_body_is_documented():
+    request_body = main.app.openapi()["paths"]["/api/invoices"]["post"]["requestBody"]
+    assert request_body["required"] is True
+    schema = request_body["content"]["application/json"]["schema"]
+    assert "client_id" in schema["required"]
+    assert schema["properties"]["items"]["items"]["properties"]["quantity"]["type"] == "number"
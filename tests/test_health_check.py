@@ -0,0 +1,66 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import database
+import main
+
+client = TestClient(main.app)
+
+
+class FakeDb:
+    def __init__(self, error=None):
+        self.error = error
+        self.pings = 0
+
+    async def command(self, name):
+        assert name == "ping"
+        self.pings += 1
+        if self.error is not None:
+            raise self.error
+        return {"ok": 1}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: now[0])
+    monkeypatch.setattr(main, "_last_check", (0.0, None))
+    return now
+
+
+def test_healthy_result_reused_within_ttl(monkeypatch, clock):
+    db = FakeDb()
+    monkeypatch.setattr(database, "db", db)
+    first = client.get("/test").json()
+    assert first["database"] == "✅ Connected & Working"
+    clock[0] += main._HEALTH_TTL - 1
+    assert client.get("/test").json() == first
+    assert db.pings == 1
+
+
+def test_refreshed_after_ttl(monkeypatch, clock):
+    db = FakeDb()
+    monkeypatch.setattr(database, "db", db)
+    client.get("/test")
+    clock[0] += main._HEALTH_TTL
+    client.get("/test")
+    assert db.pings == 2
+
+
+def test_ping_error_is_reported_and_not_cached(monkeypatch, clock):
+    db = FakeDb(RuntimeError("connection refused"))
+    monkeypatch.setattr(database, "db", db)
+    body = client.get("/test").json()
+    assert body["database"] == "⚠️  Connected but Error: connection refused"
+    assert body["connection_status"] == "Connected"
+
+    db.error = None
+    assert client.get("/test").json()["database"] == "✅ Connected & Working"
+    assert db.pings == 2
+
+
+def test_uninitialized_database(monkeypatch, clock):
+    monkeypatch.setattr(database, "db", None)
+    body = client.get("/test").json()
+    assert body["database"] == "⚠️  Available but not initialized"
+    assert body["connection_status"] == "Not Connected"
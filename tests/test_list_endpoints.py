@@ -0,0 +1,178 @@
+import asyncio
+import inspect
+
+import orjson
+import pytest
+
+import main
+
+
+def _endpoint(name):
+    return next(r.endpoint for r in main.app.routes if getattr(r, "name", None) == name)
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    async def next(self):
+        try:
+            return next(self._docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.next()
+
+
+def _call(endpoint, **params):
+    """Run a handler and return its full response body"""
+    async def run():
+        response = await endpoint(**params)
+        if hasattr(response, "body_iterator"):
+            return b"".join([chunk async for chunk in response.body_iterator])
+        return response.body
+    return asyncio.run(run())
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    main._list_cache.clear()
+    yield
+    main._list_cache.clear()
+
+
+@pytest.fixture
+def find_calls(monkeypatch):
+    calls = []
+
+    def find_documents(collection_name, filt=None, projection=None):
+        calls.append((collection_name, filt, projection))
+        return FakeCursor([{"_id": "1", "name": "a"}, {"_id": "2", "name": "b"}])
+
+    for name in ("list_tasks", "list_invoices"):
+        monkeypatch.setitem(_endpoint(name).__globals__, "find_documents", find_documents)
+    return calls
+
+
+@pytest.fixture
+def get_calls(monkeypatch):
+    calls = []
+
+    async def get_documents(collection_name, filt=None, projection=None):
+        calls.append((collection_name, filt))
+        return [{"_id": "1", "name": "a"}]
+
+    monkeypatch.setitem(_endpoint("list_clients").__globals__, "get_documents", get_documents)
+    return calls
+
+
+@pytest.mark.parametrize("name, params", [
+    ("list_clients", []),
+    ("list_employees", []),
+    ("list_projects", []),
+    ("list_tasks", ["project_id"]),
+    ("list_invoices", ["client_id", "project_id"]),
+])
+def test_generated_signatures(name, params):
+    endpoint = _endpoint(name)
+    signature = inspect.signature(endpoint)
+    assert list(signature.parameters) == params
+    assert all(p.default is None for p in signature.parameters.values())
+    assert endpoint.__module__ == "main"
+
+
+def test_streamed_list_builds_filter_from_given_keys(find_calls):
+    list_invoices = _endpoint("list_invoices")
+    _call(list_invoices)
+    _call(list_invoices, client_id="c")
+    _call(list_invoices, project_id="p")
+    _call(list_invoices, client_id="c", project_id="p")
+    assert [filt for _, filt, _ in find_calls] == [
+        {}, {"client_id": "c"}, {"project_id": "p"}, {"client_id": "c", "project_id": "p"},
+    ]
+    assert all(name == "invoice" for name, _, _ in find_calls)
+    assert find_calls[0][2] == main._META["invoice"][0]
+
+
+def test_streamed_list_body(find_calls):
+    body = _call(_endpoint("list_tasks"), project_id="p")
+    assert orjson.loads(body) == [{"name": "a", "id": "1"}, {"name": "b", "id": "2"}]
+
+
+def test_streamed_list_empty(monkeypatch):
+    list_tasks = _endpoint("list_tasks")
+    monkeypatch.setitem(list_tasks.__globals__, "find_documents", lambda *args: FakeCursor([]))
+    assert _call(list_tasks) == b"[]"
+
+
+def test_cached_list_reuses_body_until_invalidated(get_calls):
+    list_clients = _endpoint("list_clients")
+    first = _call(list_clients)
+    second = _call(list_clients)
+    assert first == second == b'[{"name":"a","id":"1"}]'
+    assert get_calls == [("client", None)]
+    assert ("client", frozenset()) in main._list_cache
+
+    main._invalidate_cache("client")
+    _call(list_clients)
+    assert len(get_calls) == 2
+
+
+def test_cached_list_skips_store_after_concurrent_write(monkeypatch):
+    list_clients = _endpoint("list_clients")
+
+    async def get_documents(collection_name, filt=None, projection=None):
+        main._invalidate_cache("client")  # a create_client lands while the query is in flight
+        return []
+
+    monkeypatch.setitem(list_clients.__globals__, "get_documents", get_documents)
+    _call(list_clients)
+    assert ("client", frozenset()) not in main._list_cache
+
+
+@pytest.fixture
+def aggregate_calls(monkeypatch):
+    calls = []
+
+    def aggregate_documents(collection_name, pipeline):
+        calls.append((collection_name, pipeline))
+        return FakeCursor([
+            {"_id": "t1", "title": "cut", "project_id": "p1",
+             "project": {"id": "p1", "name": "Promo", "client_id": "c1", "status": "active"}},
+            {"_id": "t2", "title": "loose"},
+        ])
+
+    monkeypatch.setattr(main, "aggregate_documents", aggregate_documents)
+    return calls
+
+
+def test_tasks_with_project_pipeline(aggregate_calls):
+    _call(main.list_tasks_with_project, project_id=None)
+    _call(main.list_tasks_with_project, project_id="p1")
+    (_, unfiltered), (collection_name, filtered) = aggregate_calls
+    assert collection_name == "task"
+    assert [next(iter(stage)) for stage in unfiltered] == ["$project", "$lookup", "$unwind"]
+    assert [next(iter(stage)) for stage in filtered] == ["$match", "$project", "$lookup", "$unwind"]
+    assert filtered[0] == {"$match": {"project_id": "p1"}}
+    assert filtered[1:] == unfiltered
+    assert unfiltered[1]["$lookup"]["from"] == "project"
+    assert unfiltered[2]["$unwind"] == {"path": "$project", "preserveNullAndEmptyArrays": True}
+
+
+def test_tasks_with_project_body(aggregate_calls):
+    body = orjson.loads(_call(main.list_tasks_with_project, project_id=None))
+    assert body == [
+        {"id": "t1", "title": "cut", "project_id": "p1",
+         "project": {"id": "p1", "name": "Promo", "client_id": "c1", "status": "active"}},
+        {"id": "t2", "title": "loose"},
+    ]
+    assert "project" not in body[1]
+
+
+def test_cached_list_rejects_filter_keys():
+    with pytest.raises(ValueError, match="cannot take filter keys"):
+        main._register_list_endpoint("client", "clients_by_email", ("email",), cached=True)
@@ -0,0 +1,68 @@
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from middleware import FastCORSMiddleware
+
+
+async def echo_method(request):
+    return PlainTextResponse(request.method, headers={"x-app": "1"})
+
+
+app = Starlette(routes=[Route("/", echo_method, methods=["GET", "POST", "OPTIONS"])])
+app.add_middleware(FastCORSMiddleware)
+client = TestClient(app)
+
+ORIGIN = "http://example.com"
+
+
+def test_preflight_short_circuits_with_echoed_headers():
+    response = client.options("/", headers={
+        "Origin": ORIGIN,
+        "Access-Control-Request-Method": "POST",
+        "Access-Control-Request-Headers": "content-type,x-token",
+    })
+    assert response.status_code == 200
+    assert response.text == "OK"
+    assert "x-app" not in response.headers
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["access-control-allow-headers"] == "content-type,x-token"
+    assert "POST" in response.headers["access-control-allow-methods"]
+    assert response.headers["access-control-max-age"] == "600"
+
+
+def test_preflight_without_requested_headers():
+    response = client.options("/", headers={"Origin": ORIGIN, "Access-Control-Request-Method": "GET"})
+    assert response.status_code == 200
+    assert "access-control-allow-headers" not in response.headers
+
+
+def test_options_without_origin_reaches_app():
+    response = client.options("/", headers={"Access-Control-Request-Method": "POST"})
+    assert response.text == "OPTIONS"
+    assert response.headers["x-app"] == "1"
+    assert "access-control-allow-origin" not in response.headers
+
+
+def test_options_without_request_method_reaches_app():
+    response = client.options("/", headers={"Origin": ORIGIN})
+    assert response.text == "OPTIONS"
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+
+
+def test_simple_cross_origin_response_gets_cors_headers():
+    response = client.get("/", headers={"Origin": ORIGIN})
+    assert response.text == "GET"
+    assert response.headers["x-app"] == "1"
+    assert response.headers["access-control-allow-origin"] == ORIGIN
+    assert response.headers["access-control-allow-credentials"] == "true"
+    assert response.headers["vary"] == "Origin"
+
+
+def test_same_origin_request_untouched():
+    response = client.post("/")
+    assert response.text == "POST"
+    assert not any(name.startswith("access-control-") for name in response.headers)
+    assert "vary" not in response.headers
@@ -0,0 +1,27 @@
+import pytest
+
+from schemas import Invoice
+
+
+def _invoice(items=(), **kwargs):
+    return Invoice(client_id="c1", items=[
+        {"description": f"line {i}", "quantity": q, "unit_price": p} for i, (q, p) in enumerate(items)
+    ], **kwargs)
+
+
+def test_subtotal_and_total():
+    invoice = _invoice([(2, 5.0), (3, 1.5)], tax_rate=0.1, discount=2.0)
+    assert invoice.subtotal == pytest.approx(14.5)
+    assert invoice.total == pytest.approx(14.5 * 1.1 - 2.0)
+
+
+def test_empty_items():
+    invoice = _invoice(discount=3.0)
+    assert invoice.subtotal == 0.0
+    assert invoice.total == -3.0
+
+
+def test_totals_are_stored_by_model_dump():
+    dumped = _invoice([(1, 10.0)], tax_rate=0.2).model_dump()
+    assert dumped["subtotal"] == pytest.approx(10.0)
+    assert dumped["total"] == pytest.approx(12.0)